@@ -3,9 +3,13 @@
 Example script demonstrating how to use the Risk Scoring Agent system
 """
 
+import os
 import time
-import json
-from risk_scoring_agent import RiskScoringSystem, generate_sample_data
+from risk_scoring_agent import (RiskScoringSystem, generate_sample_data,
+                                generate_sample_data_batch)
+
+# Optional pause between the random assessments, for watching a live demo
+INTERACTIVE_DELAY = float(os.environ.get('RISK_DEMO_DELAY', '0'))
 
 def main():
     print("🎯 Risk Scoring Agent System Example")
@@ -26,9 +30,6 @@ def main():
     print("\n🚀 Starting all agents...")
     system.start_all_agents()
     
-    # Wait for agents to initialize
-    time.sleep(2)
-    
     # Generate and process some sample risk assessments
     print("\n📈 Processing risk assessments...")
     
@@ -72,7 +73,7 @@ def main():
             assessments.append(assessment)
             
             print(f"  Risk Score: {assessment.risk_score:.3f}")
-            print(f"  Risk Level: {assessment.risk_level.value.upper()}")
+            print(f"  Risk Level: {assessment.risk_level_str.upper()}")
             print(f"  Confidence: {assessment.confidence:.2f}")
             print(f"  Factors:")
             for factor, value in assessment.factors.items():
@@ -90,11 +91,12 @@ def main():
         sample_data = generate_sample_data()
         try:
             assessment = agent.assess_risk(sample_data)
-            print(f"  {assessment.entity_id}: {assessment.risk_score:.3f} ({assessment.risk_level.value})")
+            print(f"  {assessment.entity_id}: {assessment.risk_score:.3f} ({assessment.risk_level_str})")
         except Exception as e:
             print(f"  ❌ Error processing {sample_data['entity_id']}: {e}")
         
-        time.sleep(0.5)  # Small delay between assessments
+        if INTERACTIVE_DELAY:
+            time.sleep(INTERACTIVE_DELAY)
     
     # Display system health
     print(f"\n🏥 System Health Summary")
@@ -134,55 +136,59 @@ def main():
             print(f"\n{agent_id} (last 5 assessments):")
             for assessment in recent_assessments[-5:]:
                 print(f"  {assessment.entity_id}: {assessment.risk_score:.3f} "
-                      f"({assessment.risk_level.value}) - {assessment.timestamp.strftime('%H:%M:%S')}")
+                      f"({assessment.risk_level_str}) - {assessment.timestamp.strftime('%H:%M:%S')}")
     
     # Export assessment data
     print(f"\n💾 Exporting assessment data...")
     
-    all_assessments = []
-    for agent_id in agent_ids:
-        agent = system.agents[agent_id]
-        agent_assessments = agent.get_assessment_history()
-        
-        for assessment in agent_assessments:
-            all_assessments.append({
-                'agent_id': agent_id,
-                'entity_id': assessment.entity_id,
-                'risk_score': assessment.risk_score,
-                'risk_level': assessment.risk_level.value,
-                'confidence': assessment.confidence,
-                'timestamp': assessment.timestamp.isoformat(),
-                'factors': assessment.factors
-            })
-    
-    # Save to JSON file
-    with open('risk_assessments.json', 'w') as f:
-        json.dump(all_assessments, f, indent=2)
-    
-    print(f"✅ Exported {len(all_assessments)} assessments to 'risk_assessments.json'")
+    # Stream records into a single JSON array file
+    exported = 0
+    with open('risk_assessments.json', 'wb') as f:
+        f.write(b'[')
+        for agent_id in agent_ids:
+            for record in system.agents[agent_id].iter_assessments_json():
+                if exported:
+                    f.write(b',')
+                f.write(record)
+                exported += 1
+        f.write(b']')
+    
+    print(f"✅ Exported {exported} assessments to 'risk_assessments.json'")
     
     # Performance test
     print(f"\n⚡ Performance Test")
     print("=" * 20)
     
     print("Running 50 rapid assessments...")
-    start_time = time.time()
+    entities_df = generate_sample_data_batch(50)
+    start_time = time.perf_counter()
     
-    for i in range(50):
-        agent_id = agent_ids[i % len(agent_ids)]
-        agent = system.agents[agent_id]
-        sample_data = generate_sample_data()
-        
-        try:
-            assessment = agent.assess_risk(sample_data)
-        except Exception as e:
-            print(f"Error in assessment {i}: {e}")
+    # One vectorized batch, split evenly across the agents
+    try:
+        system.assess_risk_batch(entities_df)
+    except Exception as e:
+        print(f"Error in batch assessment: {e}")
     
-    end_time = time.time()
+    end_time = time.perf_counter()
     duration = end_time - start_time
     
     print(f"✅ Completed 50 assessments in {duration:.2f} seconds")
-    print(f"📊 Average rate: {50/duration:.2f} assessments/second")
+    print(f"📊 Average rate: {50/max(duration, 1e-9):.2f} assessments/second")
+    
+    print("Running 50 parallel single-entity assessments...")
+    entities = [generate_sample_data() for _ in range(50)]
+    start_time = time.perf_counter()
+    
+    # Dispatched round-robin to the agents on the system's thread pool
+    try:
+        system.assess_many(entities)
+    except Exception as e:
+        print(f"Error in parallel assessment: {e}")
+    
+    duration = time.perf_counter() - start_time
+    
+    print(f"✅ Completed 50 assessments in {duration:.2f} seconds")
+    print(f"📊 Average rate: {50/max(duration, 1e-9):.2f} assessments/second")
     
     # Final system health check
     print(f"\n🔍 Final System Health Check")
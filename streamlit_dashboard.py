@@ -5,33 +5,23 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import time
 from datetime import datetime, timedelta
 import json
-from risk_scoring_agent import RiskScoringSystem, AgentStatus, RiskLevel, generate_sample_data
+from risk_scoring_agent import (RiskScoringSystem, AgentStatus, AgentHealthMetrics, RiskLevel,
+                                generate_sample_data)
 import threading
 import random
-import streamlit as st
 import time
-@st.cache_data(ttl=5)
-def fetch_data():
-    return generate_sample_data()
-
-data = fetch_data()
-st.dataframe(data)
-
-
 
-# Configure page
-st.set_page_config(
-    page_title="Risk Agent Health Dashboard",
-    page_icon="🎯",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+try:
+    from tsdownsample import LTTBDownsampler
+    _TSDOWNSAMPLE = True
+except ImportError:
+    _TSDOWNSAMPLE = False
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS, injected at the top of every full run; fragment ticks don't
+# re-run it, and skipping it on a full run would drop the styles
+CUSTOM_CSS = """
 <style>
     .metric-card {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -49,237 +39,110 @@ st.markdown("""
     .risk-high { background-color: #f8d7da; color: #721c24; }
     .risk-critical { background-color: #f5c6cb; color: #721c24; }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# Initialize session state
-if 'system' not in st.session_state:
-    st.session_state.system = RiskScoringSystem()
+# Configure page
+st.set_page_config(
+    page_title="Risk Agent Health Dashboard",
+    page_icon="🎯",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS for better styling
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_system() -> RiskScoringSystem:
+    """Risk scoring system shared by all sessions, created once per server"""
+    system = RiskScoringSystem()
     # Add agents
     for i in range(3):
-        st.session_state.system.add_agent(f"agent_{i+1}")
-    st.session_state.system.start_all_agents()
+        system.add_agent(f"agent_{i+1}")
+    system.start_all_agents()
+    return system
+
+system = get_system()
 
+# Initialize session state
 if 'auto_generate' not in st.session_state:
     st.session_state.auto_generate = False
 
-if 'generation_thread' not in st.session_state:
-    st.session_state.generation_thread = None
-
-def generate_assessments():
-    """Generate risk assessments in background"""
-    while st.session_state.auto_generate:
-        try:
-            agent_id = random.choice(list(st.session_state.system.agents.keys()))
-            agent = st.session_state.system.agents[agent_id]
-            sample_data = generate_sample_data()
-            agent.assess_risk(sample_data)
-            time.sleep(random.uniform(1, 3))
-        except Exception as e:
-            print(f"Error generating assessment: {e}")
-            time.sleep(1)
+# Display colors, keyed by enum and by enum value (for Plotly color maps)
+DEFAULT_COLOR = "#6c757d"
+STATUS_COLORS = {
+    AgentStatus.HEALTHY: "#28a745",
+    AgentStatus.WARNING: "#ffc107",
+    AgentStatus.CRITICAL: "#dc3545",
+    AgentStatus.OFFLINE: "#6c757d"
+}
+RISK_COLORS = {
+    RiskLevel.LOW: "#28a745",
+    RiskLevel.MEDIUM: "#ffc107",
+    RiskLevel.HIGH: "#fd7e14",
+    RiskLevel.CRITICAL: "#dc3545"
+}
+STATUS_COLOR_MAP = {status.value: color for status, color in STATUS_COLORS.items()}
+RISK_COLOR_MAP = {level.value: color for level, color in RISK_COLORS.items()}
 
 def get_status_color(status: AgentStatus) -> str:
     """Get color for agent status"""
-    colors = {
-        AgentStatus.HEALTHY: "#28a745",
-        AgentStatus.WARNING: "#ffc107", 
-        AgentStatus.CRITICAL: "#dc3545",
-        AgentStatus.OFFLINE: "#6c757d"
-    }
-    return colors.get(status, "#6c757d")
+    return STATUS_COLORS.get(status, DEFAULT_COLOR)
 
 def get_risk_color(risk_level: RiskLevel) -> str:
     """Get color for risk level"""
-    colors = {
-        RiskLevel.LOW: "#28a745",
-        RiskLevel.MEDIUM: "#ffc107",
-        RiskLevel.HIGH: "#fd7e14",
-        RiskLevel.CRITICAL: "#dc3545"
-    }
-    return colors.get(risk_level, "#6c757d")
-
-# Main dashboard
-st.title("🎯 Risk Scoring Agent Health Dashboard")
-
-# Sidebar controls
-st.sidebar.header("🛠️ Controls")
-
-# Auto-generate toggle
-auto_generate = st.sidebar.toggle(
-    "Auto-generate assessments",
-    value=st.session_state.auto_generate,
-    help="Automatically generate risk assessments for testing"
-)
-
-if auto_generate != st.session_state.auto_generate:
-    st.session_state.auto_generate = auto_generate
-    if auto_generate:
-        st.session_state.generation_thread = threading.Thread(
-            target=generate_assessments, daemon=True
-        )
-        st.session_state.generation_thread.start()
-
-# Manual assessment button
-if st.sidebar.button("🎲 Generate Single Assessment"):
-    agent_id = random.choice(list(st.session_state.system.agents.keys()))
-    agent = st.session_state.system.agents[agent_id]
-    sample_data = generate_sample_data()
-    assessment = agent.assess_risk(sample_data)
-    st.sidebar.success(f"Generated assessment for {assessment.entity_id}")
-
-# Refresh rate
-refresh_rate = st.sidebar.selectbox(
-    "Refresh rate (seconds)",
-    options=[1, 5, 10, 30],
-    index=1
-)
-
-# Auto-refresh
-auto_refresh = st.sidebar.toggle("Auto-refresh", value=True)
+    return RISK_COLORS.get(risk_level, DEFAULT_COLOR)
 
-# System overview
-st.header("📊 System Overview")
-system_health = st.session_state.system.get_system_health()
-
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric(
-        "Total Assessments",
-        system_health['total_assessments'],
-        delta=None
-    )
-
-with col2:
-    st.metric(
-        "Active Agents",
-        f"{system_health['active_agents']}/{system_health['total_agents']}",
-        delta=None
-    )
-
-with col3:
-    st.metric(
-        "Avg Response Time",
-        f"{system_health['average_response_time']:.2f}s",
-        delta=None
-    )
-
-with col4:
-    uptime_hours = system_health['system_uptime'] / 3600
-    st.metric(
-        "System Uptime",
-        f"{uptime_hours:.1f}h",
-        delta=None
-    )
-
-# Agent health status
-st.header("🏥 Agent Health Status")
-agent_health = st.session_state.system.get_all_agent_health()
-
-# Create agent health dataframe
-agent_df = pd.DataFrame([
-    {
-        'Agent ID': agent.agent_id,
-        'Status': agent.status.value,
-        'Uptime (min)': agent.uptime / 60,
-        'Response Time (s)': agent.response_time,
-        'Error Rate (%)': agent.error_rate * 100,
-        'Throughput (req/s)': agent.throughput,
-        'CPU Usage (%)': agent.cpu_usage,
-        'Memory Usage (%)': agent.memory_usage,
-        'Active Assessments': agent.active_assessments,
-        'Last Heartbeat': agent.last_heartbeat
-    }
-    for agent in agent_health
-])
-
-# Display agent status cards
-cols = st.columns(len(agent_health))
-for i, (col, agent) in enumerate(zip(cols, agent_health)):
-    with col:
-        status_color = get_status_color(agent.status)
-        st.markdown(f"""
-        <div style="
-            border: 2px solid {status_color};
-            border-radius: 10px;
-            padding: 1rem;
-            margin: 0.5rem 0;
-            background: rgba(255,255,255,0.05);
-        ">
-            <h4 style="margin: 0; color: {status_color};">
-                {agent.agent_id.upper()}
-            </h4>
-            <p style="margin: 0.5rem 0; color: {status_color};">
-                <strong>Status:</strong> {agent.status.value.upper()}
-            </p>
-            <p style="margin: 0.2rem 0; font-size: 0.9rem;">
-                <strong>Uptime:</strong> {agent.uptime/60:.1f}m
-            </p>
-            <p style="margin: 0.2rem 0; font-size: 0.9rem;">
-                <strong>Response:</strong> {agent.response_time:.2f}s
-            </p>
-            <p style="margin: 0.2rem 0; font-size: 0.9rem;">
-                <strong>Error Rate:</strong> {agent.error_rate*100:.1f}%
-            </p>
-            <p style="margin: 0.2rem 0; font-size: 0.9rem;">
-                <strong>CPU:</strong> {agent.cpu_usage:.1f}%
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-# Detailed metrics table
-st.subheader("📋 Detailed Agent Metrics")
-st.dataframe(
-    agent_df.style.format({
-        'Uptime (min)': '{:.1f}',
-        'Response Time (s)': '{:.2f}',
-        'Error Rate (%)': '{:.1f}',
-        'Throughput (req/s)': '{:.2f}',
-        'CPU Usage (%)': '{:.1f}',
-        'Memory Usage (%)': '{:.1f}',
-        'Last Heartbeat': lambda x: x.strftime('%H:%M:%S')
-    }),
-    use_container_width=True
-)
-
-# Performance charts
-st.header("📈 Performance Metrics")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    # Response time chart
-    fig_response = px.bar(
-        agent_df,
-        x='Agent ID',
-        y='Response Time (s)',
-        title='Response Time by Agent',
-        color='Status',
-        color_discrete_map={
-            'healthy': '#28a745',
-            'warning': '#ffc107',
-            'critical': '#dc3545',
-            'offline': '#6c757d'
+def build_agent_df(agent_health: list) -> pd.DataFrame:
+    """Build the agent health table"""
+    return pd.DataFrame([
+        {
+            'Agent ID': agent.agent_id,
+            'Status': agent.status.value,
+            'Uptime (min)': agent.uptime / 60,
+            'Response Time (s)': agent.response_time,
+            'Error Rate (%)': agent.error_rate * 100,
+            'Throughput (req/s)': agent.throughput,
+            'CPU Usage (%)': agent.cpu_usage,
+            'Memory Usage (%)': agent.memory_usage,
+            'Active Assessments': agent.active_assessments,
+            'Last Heartbeat': agent.last_heartbeat
         }
+        for agent in agent_health
+    ])
+
+@st.cache_data(ttl=2, max_entries=4)
+def system_snapshot(version: int) -> tuple:
+    """System health, agent health and the agent table, rebuilt only when version
+    changes or the ttl expires (health values such as heartbeat change every call)"""
+    agent_health = system.get_all_agent_health()
+    return system.get_system_health(), agent_health, build_agent_df(agent_health)
+
+@st.cache_resource
+def response_figure() -> tuple:
+    """Response time bar chart skeleton, built once; returns (figure, lock)"""
+    fig = go.Figure(go.Bar(x=[], y=[]))
+    fig.update_layout(
+        title='Response Time by Agent',
+        xaxis_title='Agent ID',
+        yaxis_title='Response Time (s)',
+        height=400
     )
-    fig_response.update_layout(height=400)
-    st.plotly_chart(fig_response, use_container_width=True)
+    return fig, threading.Lock()
 
-with col2:
-    # System usage chart
+@st.cache_resource
+def usage_figure() -> tuple:
+    """CPU/memory gauge figure skeleton, built once; returns (figure, lock)"""
     fig_usage = make_subplots(
         rows=1, cols=2,
         subplot_titles=('CPU Usage', 'Memory Usage'),
         specs=[[{"type": "indicator"}, {"type": "indicator"}]]
     )
     
-    avg_cpu = agent_df['CPU Usage (%)'].mean()
-    avg_memory = agent_df['Memory Usage (%)'].mean()
-    
     fig_usage.add_trace(
         go.Indicator(
             mode="gauge+number",
-            value=avg_cpu,
+            value=0,
             title={'text': "Avg CPU %"},
             gauge={'axis': {'range': [None, 100]},
                    'bar': {'color': "darkblue"},
@@ -293,11 +156,11 @@ with col2:
         ),
         row=1, col=1
     )
-    
+
     fig_usage.add_trace(
         go.Indicator(
             mode="gauge+number",
-            value=avg_memory,
+            value=0,
             title={'text': "Avg Memory %"},
             gauge={'axis': {'range': [None, 100]},
                    'bar': {'color': "darkgreen"},
@@ -311,114 +174,381 @@ with col2:
         ),
         row=1, col=2
     )
-    
+
     fig_usage.update_layout(height=400)
-    st.plotly_chart(fig_usage, use_container_width=True)
+    return fig_usage, threading.Lock()
+
+def factor_box_figure(assessments_df: pd.DataFrame) -> go.Figure:
+    """Box plot of factor scores by risk level, from box stats computed per level in NumPy"""
+    fig = go.Figure()
+    # Risk Level is categorical in RiskLevel order, so group on its integer codes
+    codes = assessments_df['Risk Level'].cat.codes.to_numpy()
+    values = assessments_df[FACTOR_COLUMNS].to_numpy()
+    for code, level in enumerate(RiskLevel):
+        group = values[codes == code]
+        if not len(group):
+            continue
+        q1, median, q3 = np.quantile(group, [0.25, 0.5, 0.75], axis=0)
+        # Whiskers reach the furthest points within 1.5 IQR, as Plotly computes them
+        iqr = q3 - q1
+        lower = np.where(group >= q1 - 1.5 * iqr, group, np.inf).min(axis=0)
+        upper = np.where(group <= q3 + 1.5 * iqr, group, -np.inf).max(axis=0)
+        fig.add_trace(go.Box(
+            name=level.value,
+            x=FACTOR_COLUMNS,
+            q1=q1, median=median, q3=q3,
+            lowerfence=lower, upperfence=upper,
+            marker_color=RISK_COLORS[level]
+        ))
+    fig.update_layout(
+        title='Risk Factor Distribution by Risk Level',
+        xaxis_title='Risk Factor',
+        yaxis_title='Score',
+        legend_title_text='Risk Level',
+        boxmode='group'
+    )
+    return fig
+
+def agent_card_html(agent: AgentHealthMetrics) -> str:
+    """HTML for one agent status card"""
+    status_color = get_status_color(agent.status)
+    return (
+        f'<div style="border: 2px solid {status_color}; border-radius: 10px; '
+        f'padding: 1rem; margin: 0.5rem 0; background: rgba(255,255,255,0.05);">'
+        f'<h4 style="margin: 0; color: {status_color};">{agent.agent_id.upper()}</h4>'
+        f'<p style="margin: 0.5rem 0; color: {status_color};">'
+        f'<strong>Status:</strong> {agent.status.value.upper()}</p>'
+        f'<p style="margin: 0.2rem 0; font-size: 0.9rem;">'
+        f'<strong>Uptime:</strong> {agent.uptime/60:.1f}m</p>'
+        f'<p style="margin: 0.2rem 0; font-size: 0.9rem;">'
+        f'<strong>Response:</strong> {agent.response_time:.2f}s</p>'
+        f'<p style="margin: 0.2rem 0; font-size: 0.9rem;">'
+        f'<strong>Error Rate:</strong> {agent.error_rate*100:.1f}%</p>'
+        f'<p style="margin: 0.2rem 0; font-size: 0.9rem;">'
+        f'<strong>CPU:</strong> {agent.cpu_usage:.1f}%</p>'
+        '</div>'
+    )
 
-# Recent assessments
-st.header("📊 Recent Risk Assessments")
-
-# Collect recent assessments from all agents
-all_assessments = []
-for agent in st.session_state.system.agents.values():
-    recent_assessments = agent.get_assessment_history(limit=50)
-    for assessment in recent_assessments:
-        all_assessments.append({
-            'Agent ID': agent.agent_id,
-            'Entity ID': assessment.entity_id,
-            'Risk Score': assessment.risk_score,
-            'Risk Level': assessment.risk_level.value,
-            'Confidence': assessment.confidence,
-            'Timestamp': assessment.timestamp,
-            'Financial Exposure': assessment.factors.get('financial_exposure', 0),
-            'Credit History': assessment.factors.get('credit_history', 0),
-            'Market Volatility': assessment.factors.get('market_volatility', 0),
-            'Regulatory Compliance': assessment.factors.get('regulatory_compliance', 0),
-            'Operational Risk': assessment.factors.get('operational_risk', 0)
-        })
-
-if all_assessments:
-    assessments_df = pd.DataFrame(all_assessments)
-    assessments_df = assessments_df.sort_values('Timestamp', ascending=False)
+# Plotly config for charts with nothing to zoom, pan or hover
+STATIC_PLOT_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Assessments per agent behind the risk-over-time scatter, and the most
+# points it sends to the browser after LTTB downsampling
+TIMELINE_LIMIT = 1000
+SCATTER_MAX_POINTS = 500
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points keeping the shape of y(x), x sorted"""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    if _TSDOWNSAMPLE:
+        return LTTBDownsampler().downsample(x, y, n_out=n_out)
     
-    # Risk distribution chart
-    col1, col2 = st.columns(2)
+    x = (x - x[0]).astype(np.float64)
+    y = y.astype(np.float64)
+    # First and last points are kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (just the last point for the final bucket)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                       (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        indices[i + 1] = a
+    return indices
+
+# Risk levels, lowest first; the category order of the Risk Level column
+RISK_LEVELS = [level.value for level in RiskLevel]
+
+# Factor columns, in RiskAssessment.factor_values order
+FACTOR_COLUMNS = ['Financial Exposure', 'Credit History', 'Market Volatility',
+                  'Regulatory Compliance', 'Operational Risk']
+
+@st.cache_data(ttl=60, max_entries=32)
+def build_assessments_df(version: int) -> pd.DataFrame:
+    """Build the recent assessments table column-wise; version keys the cache"""
+    agent_codes = []
+    assessments = []
+    for code, agent in enumerate(system.agents.values()):
+        agent_assessments = agent.get_assessment_history(limit=50)
+        agent_codes.extend([code] * len(agent_assessments))
+        assessments.extend(agent_assessments)
     
+    factors = np.array([a.factor_values for a in assessments],
+                       dtype=np.float64).reshape(-1, len(FACTOR_COLUMNS))
+    columns = {
+        'Agent ID': pd.Categorical.from_codes(agent_codes, categories=system.agent_ids),
+        'Entity ID': [a.entity_id for a in assessments],
+        'Risk Score': np.fromiter((a.risk_score for a in assessments),
+                                  dtype=np.float64, count=len(assessments)),
+        'Risk Level': pd.Categorical([a.risk_level_str for a in assessments],
+                                     categories=RISK_LEVELS, ordered=True),
+        'Confidence': np.fromiter((a.confidence for a in assessments),
+                                  dtype=np.float64, count=len(assessments)),
+        'Timestamp': pd.to_datetime([a.timestamp for a in assessments]),
+    }
+    for i, name in enumerate(FACTOR_COLUMNS):
+        columns[name] = factors[:, i]
+    return pd.DataFrame(columns, copy=False)
+
+@st.cache_data(ttl=60, max_entries=32)
+def build_timeline_df(version: int) -> pd.DataFrame:
+    """Timestamp, score and level of up to TIMELINE_LIMIT assessments per agent, oldest first"""
+    assessments = [
+        assessment
+        for agent in system.agents.values()
+        for assessment in agent.get_assessment_history(limit=TIMELINE_LIMIT)
+    ]
+    order = np.argsort(np.fromiter((a.timestamp_ns for a in assessments),
+                                   dtype=np.int64, count=len(assessments)), kind='stable')
+    assessments = [assessments[i] for i in order]
+    return pd.DataFrame({
+        'Timestamp': pd.to_datetime([a.timestamp for a in assessments]),
+        'Risk Score': np.fromiter((a.risk_score for a in assessments),
+                                  dtype=np.float64, count=len(assessments)),
+        'Risk Level': pd.Categorical([a.risk_level_str for a in assessments],
+                                     categories=RISK_LEVELS, ordered=True),
+    }, copy=False)
+
+# Main dashboard
+st.title("🎯 Risk Scoring Agent Health Dashboard")
+
+# Sidebar controls
+st.sidebar.header("🛠️ Controls")
+
+# Auto-generate toggle
+auto_generate = st.sidebar.toggle(
+    "Auto-generate assessments",
+    value=st.session_state.auto_generate,
+    help="Automatically generate risk assessments for testing"
+)
+
+st.session_state.auto_generate = auto_generate
+
+# Seconds between auto-generated assessments
+AUTOGEN_INTERVAL = 2
+
+@st.fragment(run_every=AUTOGEN_INTERVAL if auto_generate else None)
+def auto_generate_assessments():
+    """Generate one risk assessment per tick while auto-generation is on"""
+    if not st.session_state.auto_generate:
+        return
+    # Full-page reruns (button clicks, widget changes) also run this fragment;
+    # skip them unless roughly an interval has passed since the last assessment,
+    # with 20% slack so timer jitter doesn't skip real ticks
+    now = time.monotonic()
+    if now - st.session_state.get('last_autogen', 0.0) < AUTOGEN_INTERVAL * 0.8:
+        return
+    st.session_state.last_autogen = now
+    try:
+        agent = system.agents[random.choice(system.agent_ids)]
+        agent.assess_risk(generate_sample_data())
+    except Exception as e:
+        print(f"Error generating assessment: {e}")
+
+auto_generate_assessments()
+
+# Manual assessment button
+if st.sidebar.button("🎲 Generate Single Assessment"):
+    agent_id = random.choice(system.agent_ids)
+    agent = system.agents[agent_id]
+    sample_data = generate_sample_data()
+    assessment = agent.assess_risk(sample_data)
+    st.sidebar.success(f"Generated assessment for {assessment.entity_id}")
+
+# Refresh rate
+refresh_rate = st.sidebar.selectbox(
+    "Refresh rate (seconds)",
+    options=[1, 5, 10, 30],
+    index=1
+)
+
+# Auto-refresh
+auto_refresh = st.sidebar.toggle("Auto-refresh", value=True)
+
+# Live panels re-run on their own timer instead of the whole script
+live_every = refresh_rate if auto_refresh else None
+
+def load_agent_health():
+    """Fetch agent health and its DataFrame from the cached snapshot"""
+    _, agent_health, agent_df = system_snapshot(system.version)
+    return agent_health, agent_df
+
+# System overview
+@st.fragment(run_every=live_every)
+def system_overview():
+    st.header("📊 System Overview")
+    system_health, _, _ = system_snapshot(system.version)
+
+    col1, col2, col3, col4 = st.columns(4)
+
     with col1:
-        risk_counts = assessments_df['Risk Level'].value_counts()
-        fig_risk_dist = px.pie(
-            values=risk_counts.values,
-            names=risk_counts.index,
-            title='Risk Level Distribution',
-            color_discrete_map={
-                'low': '#28a745',
-                'medium': '#ffc107',
-                'high': '#fd7e14',
-                'critical': '#dc3545'
-            }
+        st.metric(
+            "Total Assessments",
+            system_health['total_assessments'],
+            delta=None
         )
-        st.plotly_chart(fig_risk_dist, use_container_width=True)
-    
+
     with col2:
-        # Risk score over time
-        fig_risk_time = px.scatter(
-            assessments_df.head(100),
-            x='Timestamp',
-            y='Risk Score',
-            color='Risk Level',
-            title='Risk Scores Over Time',
-            color_discrete_map={
-                'low': '#28a745',
-                'medium': '#ffc107',
-                'high': '#fd7e14',
-                'critical': '#dc3545'
-            }
+        st.metric(
+            "Active Agents",
+            f"{system_health['active_agents']}/{system_health['total_agents']}",
+            delta=None
         )
-        st.plotly_chart(fig_risk_time, use_container_width=True)
-    
-    # Recent assessments table
-    st.subheader("📋 Recent Assessments")
+
+    with col3:
+        st.metric(
+            "Avg Response Time",
+            f"{system_health['average_response_time']:.2f}s",
+            delta=None
+        )
+
+    with col4:
+        uptime_hours = system_health['system_uptime'] / 3600
+        st.metric(
+            "System Uptime",
+            f"{uptime_hours:.1f}h",
+            delta=None
+        )
+
+# Agent health status
+@st.fragment(run_every=live_every)
+def agent_health_status():
+    st.header("🏥 Agent Health Status")
+    agent_health, agent_df = load_agent_health()
+
+    # Display agent status cards as one grid element
+    grid_style = (f"display: grid; grid-template-columns: repeat({len(agent_health)}, 1fr); "
+                  "gap: 1rem;")
+    cards = ''.join(agent_card_html(agent) for agent in agent_health)
+    st.markdown(f'<div style="{grid_style}">{cards}</div>', unsafe_allow_html=True)
+
+    # Detailed metrics table
+    st.subheader("📋 Detailed Agent Metrics")
     st.dataframe(
-        assessments_df.head(20).style.format({
-            'Risk Score': '{:.3f}',
-            'Confidence': '{:.2f}',
-            'Financial Exposure': '{:.3f}',
-            'Credit History': '{:.3f}',
-            'Market Volatility': '{:.3f}',
-            'Regulatory Compliance': '{:.3f}',
-            'Operational Risk': '{:.3f}',
-            'Timestamp': lambda x: x.strftime('%H:%M:%S')
-        }),
+        agent_df.round({
+            'Uptime (min)': 1,
+            'Response Time (s)': 2,
+            'Error Rate (%)': 1,
+            'Throughput (req/s)': 2,
+            'CPU Usage (%)': 1,
+            'Memory Usage (%)': 1
+        }).assign(**{'Last Heartbeat': agent_df['Last Heartbeat'].dt.strftime('%H:%M:%S')}),
         use_container_width=True
     )
+
+# Performance charts
+@st.fragment(run_every=live_every)
+def performance_metrics():
+    st.header("📈 Performance Metrics")
+    _, agent_df = load_agent_health()
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Response time chart; the shared figure is serialized under its lock
+        fig_response, lock = response_figure()
+        with lock:
+            fig_response.data[0].update(
+                x=agent_df['Agent ID'],
+                y=agent_df['Response Time (s)'],
+                marker_color=[STATUS_COLOR_MAP.get(status, DEFAULT_COLOR)
+                              for status in agent_df['Status']]
+            )
+            st.plotly_chart(fig_response, use_container_width=True)
+
+    with col2:
+        # System usage chart
+        avg_cpu, avg_memory = agent_df[['CPU Usage (%)', 'Memory Usage (%)']].mean()
     
-    # Risk factor analysis
-    st.subheader("🔍 Risk Factor Analysis")
-    factor_cols = ['Financial Exposure', 'Credit History', 'Market Volatility', 
-                   'Regulatory Compliance', 'Operational Risk']
+        fig_usage, lock = usage_figure()
+        with lock:
+            fig_usage.data[0].value = avg_cpu
+            fig_usage.data[1].value = avg_memory
+            st.plotly_chart(fig_usage, use_container_width=True, config=STATIC_PLOT_CONFIG)
+
+# Recent assessments
+@st.fragment(run_every=live_every)
+def recent_assessments():
+    st.header("📊 Recent Risk Assessments")
+
+    # Collect recent assessments from all agents
+    assessments_df = build_assessments_df(system.version)
+
+    if not assessments_df.empty:
+        # Risk distribution chart
+        col1, col2 = st.columns(2)
     
-    fig_factors = px.box(
-        assessments_df.melt(
-            id_vars=['Entity ID', 'Risk Level'],
-            value_vars=factor_cols,
-            var_name='Risk Factor',
-            value_name='Score'
-        ),
-        x='Risk Factor',
-        y='Score',
-        color='Risk Level',
-        title='Risk Factor Distribution by Risk Level'
-    )
-    fig_factors.update_layout(height=500)
-    st.plotly_chart(fig_factors, use_container_width=True)
+        with col1:
+            # Counts come out in RISK_LEVELS order; the pie keeps that order
+            risk_counts = (assessments_df['Risk Level'].value_counts(sort=False)
+                           .rename_axis('Risk Level').reset_index(name='Count'))
+            fig_risk_dist = px.pie(
+                risk_counts,
+                values='Count',
+                names='Risk Level',
+                color='Risk Level',
+                title='Risk Level Distribution',
+                color_discrete_map=RISK_COLOR_MAP
+            )
+            fig_risk_dist.update_traces(sort=False)
+            st.plotly_chart(fig_risk_dist, use_container_width=True, config=STATIC_PLOT_CONFIG)
+    
+        with col2:
+            # Risk score over a longer history than the table, downsampled
+            # with LTTB to at most SCATTER_MAX_POINTS
+            timeline = build_timeline_df(system.version)
+            keep = lttb_indices(timeline['Timestamp'].to_numpy(dtype=np.int64),
+                                timeline['Risk Score'].to_numpy(), SCATTER_MAX_POINTS)
+            points = timeline.iloc[keep]
+            # Long frame with a hex color column: one row per point, each in
+            # its risk level color
+            st.markdown("**Risk Scores Over Time**")
+            st.scatter_chart(
+                points[['Timestamp', 'Risk Score']].assign(
+                    Color=points['Risk Level'].astype(str).map(RISK_COLOR_MAP)),
+                x='Timestamp',
+                y='Risk Score',
+                color='Color'
+            )
+    
+        # Recent assessments table
+        st.subheader("📋 Recent Assessments")
+        recent = assessments_df.nlargest(20, 'Timestamp')
+        st.dataframe(
+            recent.round({
+                'Risk Score': 3,
+                'Confidence': 2,
+                'Financial Exposure': 3,
+                'Credit History': 3,
+                'Market Volatility': 3,
+                'Regulatory Compliance': 3,
+                'Operational Risk': 3
+            }).assign(Timestamp=recent['Timestamp'].dt.strftime('%H:%M:%S')),
+            use_container_width=True
+        )
+    
+        # Risk factor analysis
+        st.subheader("🔍 Risk Factor Analysis")
+    
+        fig_factors = factor_box_figure(assessments_df)
+        fig_factors.update_layout(height=500)
+        st.plotly_chart(fig_factors, use_container_width=True)
 
-else:
-    st.info("No risk assessments available yet. Enable auto-generation or create manual assessments to see data.")
+    else:
+        st.info("No risk assessments available yet. Enable auto-generation or create manual assessments to see data.")
 
-# Real-time monitoring
-if auto_refresh:
-    time.sleep(refresh_rate)
-    st.rerun()
+system_overview()
+agent_health_status()
+performance_metrics()
+recent_assessments()
 
 # Footer
 st.markdown("---")